@@ -33,7 +33,8 @@ setup(
     package_dir={'': 'src'},  # Root of the packages is 'src'
     python_requires='>=3.8',  # Minimum Python version required
     install_requires=[
-        'pytz>=2023.3',
+        'pytz>=2023.3; python_version < "3.9"',
+        'tzdata; platform_system == "Windows"',  # zoneinfo has no system database there
         'mysql-connector-python>=8.0.33',
         'pyserial>=3.5',
     ],  # Dependencies
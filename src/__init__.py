@@ -13,6 +13,7 @@ Features:
 """
 
 import logging
+import importlib
 from pathlib import Path
 from dataclasses import dataclass
 from typing import Optional, Dict, Any
@@ -28,21 +29,32 @@ __author_email__ = 'your.email@example.com'
 __license__ = 'MIT'
 __copyright__ = 'Copyright 2024 Your Name'
 
-# Import main components
-from .gps_parser import (
-    GPSParser,
-    GPSConfig,
-)
-
-from .utils import (
-    GPSCoordinate,
-    GPSData,
-    DatabaseManager,
-    NMEAParser,
-    GPSConnectionError,
-    DatabaseConnectionError,
-    NMEAParseError
-)
+# Main components are imported on first access (PEP 562) so that
+# `import src` does not pull in pyserial or mysql-connector up front
+_LAZY_IMPORTS = {
+    'GPSParser': '.gps_parser',
+    'GPSConfig': '.gps_parser',
+    'GPSCoordinate': '.utils',
+    'GPSData': '.utils',
+    'DatabaseManager': '.utils',
+    'NMEAParser': '.utils',
+    'GPSConnectionError': '.utils',
+    'DatabaseConnectionError': '.utils',
+    'NMEAParseError': '.utils',
+}
+
+def __getattr__(name: str) -> Any:
+    """Import lazily exported components on first access."""
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_IMPORTS))
 
 @dataclass
 class Version:
@@ -87,7 +99,10 @@ def setup_logging(
     logger.setLevel(level)
 
     if log_file:
-        handler = logging.handlers.RotatingFileHandler(
+        # logging.handlers pulls in socket, pickle and queue; only load it here
+        from logging.handlers import RotatingFileHandler
+
+        handler = RotatingFileHandler(
             log_file,
             maxBytes=max_bytes,
             backupCount=backup_count
@@ -102,6 +117,22 @@ def get_config_path() -> Path:
     """Return the default configuration directory path."""
     return Path(__file__).parent.parent / 'config'
 
+def _warm_bytecode_cache() -> None:
+    """Byte-compile the package once so later starts load every module from .pyc."""
+    sentinel = get_config_path() / '.pyc_warmed'
+    if sentinel.exists():
+        return
+
+    # Only needed on the first start, so keep it off the import path
+    import compileall
+
+    logger = logging.getLogger(__name__)
+    try:
+        if compileall.compile_dir(str(Path(__file__).parent), quiet=1):
+            sentinel.touch()
+    except OSError as e:
+        logger.warning("Could not pre-compile package bytecode: %s", e)
+
 def initialize(
     config_file: Optional[str] = None,
     log_file: Optional[str] = None,
@@ -138,11 +169,13 @@ def initialize(
             'initialized': True
         }
 
-        logger.info(f"Package initialized successfully (version {get_version()})")
+        _warm_bytecode_cache()
+
+        logger.info("Package initialized successfully (version %s)", get_version())
         return config
 
     except Exception as e:
-        logger.error(f"Initialization failed: {e}")
+        logger.error("Initialization failed: %s", e)
         return {
             'version': get_version(),
             'initialized': False,
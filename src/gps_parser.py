@@ -1,26 +1,57 @@
-import serial
+import os
+import re
+import time
 import logging
+import functools
+import selectors
 import threading
+import datetime
 import configparser
-import mysql.connector
-from queue import Queue
+from collections import deque
 from pathlib import Path
 from threading import Event
-import serial.tools.list_ports
+from types import MappingProxyType
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Tuple, Union
 
 from src.utils import (
     setup_logging,
     DatabaseManager,
     NMEAParser,
     GPSData,
-    GPSCoordinate,
     GPSConnectionError,
     DatabaseConnectionError
 )
+from src.utils.helpers import _DATACLASS_OPTIONS
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+# NMEA caps sentences at 82 characters; a longer run without a newline is
+# line noise (e.g. a baud rate mismatch) and is discarded
+_MAX_PARTIAL_LINE = 1024
+
+# Longest pause, in seconds, between retries after repeated unexpected
+# reader errors, so a persistent fault does not spin the CPU and flood the log
+_MAX_READER_BACKOFF = 5.0
+
+# One fix in GPSParser._INSERT_SQL column order: latitude, longitude, date,
+# time, speed_kmh, bearing, fix_quality. A plain tuple is what executemany
+# consumes and is cheaper to build than a dict, dataclass or namedtuple.
+GPSRow = Tuple[float, float, datetime.date, datetime.time, Optional[float], Optional[float], int]
+
+# USB-UART bridges GPS receivers are known to be attached through
+KNOWN_DEVICES = (
+    "CP2102N USB to UART Bridge Controller",
+    "Silicon Labs CP210x USB to UART Bridge"
+)
+# Matches any known device in a port description with a single scan
+_DEVICE_RE = re.compile('|'.join(map(re.escape, KNOWN_DEVICES)))
+
+if TYPE_CHECKING:
+    # pyserial is imported lazily where it is used to keep `import src` cheap
+    import serial
+
+@dataclass(**_DATACLASS_OPTIONS)
 class GPSConfig:
     """Configuration data structure for GPS Parser."""
     db_host: str
@@ -29,199 +60,575 @@ class GPSConfig:
     db_name: str
     baudrate: int
     timeout: int
+    batch_size: int = 32
+    pool_size: int = 5
+    flush_interval: float = 0.5
+    reader_priority: int = 0
+
+@functools.lru_cache(maxsize=4)
+def _read_config(config_file: str, mtime: float) -> Mapping[str, Any]:
+    """Parse a configuration file; cached until its modification time changes."""
+    config = configparser.ConfigParser()
+    config.read(config_file)
+    
+    return MappingProxyType({
+        'db_host': config.get('database', 'host', fallback='localhost'),
+        'db_user': config.get('database', 'user', fallback='root'),
+        'db_password': config.get('database', 'password', fallback=''),
+        'db_name': config.get('database', 'name', fallback='gps_data'),
+        'baudrate': config.getint('serial', 'baudrate', fallback=9600),
+        'timeout': config.getint('serial', 'timeout', fallback=1),
+        'batch_size': config.getint('database', 'batch_size', fallback=32),
+        'pool_size': config.getint('database', 'pool_size', fallback=5),
+        'flush_interval': config.getfloat('database', 'flush_interval', fallback=0.5),
+        'reader_priority': config.getint('serial', 'reader_priority', fallback=0)
+    })
+
+class _FixAccumulator:
+    """Partial GPS fix whose fields are written in place by the NMEA parsers."""
+    __slots__ = (
+        'latitude', 'longitude', 'date', 'time', 'num_satellites',
+        'high_accuracy', 'fix_quality', 'bearing', 'speed_kmh'
+    )
+    
+    def __init__(self) -> None:
+        self.reset()
+    
+    def reset(self) -> None:
+        """Start a new fix; GNGGA always sets latitude and GNVTG speed_kmh."""
+        self.latitude = None
+        self.speed_kmh = None
+    
+    def is_complete(self) -> bool:
+        """Check if both GNGGA and GNVTG data have been received."""
+        return self.latitude is not None and self.speed_kmh is not None
+    
+    def to_row(self) -> GPSRow:
+        """Return the accumulated fields in GPSParser._INSERT_SQL column order."""
+        return (
+            self.latitude,
+            self.longitude,
+            self.date,
+            self.time,
+            self.speed_kmh,
+            self.bearing,
+            self.fix_quality
+        )
 
 class GPSParser:
     """
     GPSParser connects to a GPS device via serial port, parses incoming NMEA sentences,
     and stores processed data into a MySQL database.
     """
+    # Upper bound on fixes held in memory while the database is unreachable
+    _MAX_PENDING = 10_000
+    
+    _INSERT_SQL = (
+        "INSERT INTO tbl_gps_data "
+        "(latd, lond, gps_date, gps_time, speed, bearing, interval_type) "
+        "VALUES (%s, %s, %s, %s, %s, %s, %s)"
+    )
+    
     def __init__(self, config_file: str = 'config/config.example.ini'):
-        self.logger = logging.getLogger(__name__)
+        self.logger = logger
         self._stop_event = Event()
-        self._data_queue = Queue(maxsize=1000)
+        # Single-producer/single-consumer ring of completed fixes handed from
+        # serial_reader to gps_data_handler. deque append/popleft are atomic,
+        # so no lock is taken per chunk; _wake is only set on empty -> non-empty.
+        self._ring: deque = deque(maxlen=1024)
+        self._wake = Event()
+        # Self-pipe written by stop() to wake a reader parked in select()
+        self._stop_r: Optional[int] = None
+        self._stop_w: Optional[int] = None
         
         # Load configuration
         self.config = self._load_configuration(config_file)
         
         # Initialize connections
         self.db_manager: Optional[DatabaseManager] = None
-        self.serial_port: Optional[serial.Serial] = None
+        self.serial_port: Optional['serial.Serial'] = None
+        self._port_cache: Optional[str] = None
         self.nmea_parser = NMEAParser()
+        
+        # Sentence prefix -> parser writing into a _FixAccumulator
+        self._handlers = NMEAParser.INTO_PARSERS
 
     def _load_configuration(self, config_file: str) -> GPSConfig:
         """Load and validate configuration from file."""
-        config = configparser.ConfigParser()
-        
         if not Path(config_file).exists():
             raise FileNotFoundError(f"Configuration file not found: {config_file}")
-            
-        config.read(config_file)
         
         try:
-            return GPSConfig(
-                db_host=config.get('database', 'host', fallback='localhost'),
-                db_user=config.get('database', 'user', fallback='root'),
-                db_password=config.get('database', 'password', fallback=''),
-                db_name=config.get('database', 'name', fallback='gps_data'),
-                baudrate=config.getint('serial', 'baudrate', fallback=9600),
-                timeout=config.getint('serial', 'timeout', fallback=1)
-            )
+            return GPSConfig(**_read_config(config_file, os.path.getmtime(config_file)))
         except configparser.Error as e:
-            self.logger.error(f"Configuration error: {e}")
+            self.logger.error("Configuration error: %s", e)
             raise
 
     def auto_select_serial_port(self) -> str:
         """Auto-detect the correct serial port based on known device descriptions."""
-        KNOWN_DEVICES = [
-            "CP2102N USB to UART Bridge Controller",
-            "Silicon Labs CP210x USB to UART Bridge"
-        ]
-        
-        ports = serial.tools.list_ports.comports()
-        for port in ports:
-            if any(device in port.description for device in KNOWN_DEVICES):
+        # Reuse the last detected port until a connection attempt fails
+        if self._port_cache is not None:
+            return self._port_cache
+        
+        import serial.tools.list_ports
+        
+        search = _DEVICE_RE.search
+        for port in serial.tools.list_ports.comports():
+            if port.description and search(port.description):
+                self._port_cache = port.device
                 return port.device
                 
         raise GPSConnectionError("GPS serial port not found")
 
     def connect_to_serial(self) -> None:
         """Establish a connection to the serial port."""
+        import serial
+        
+        opened = None
         try:
             port = self.auto_select_serial_port()
-            self.serial_port = serial.Serial(
+            self.serial_port = opened = serial.Serial(
                 port=port,
                 baudrate=self.config.baudrate,
                 timeout=self.config.timeout
             )
-            self.logger.info(f"Connected to serial port: {port}")
+            self.logger.info("Connected to serial port: %s", port)
+            self._enable_low_latency()
         except Exception as e:
-            self.logger.error(f"Serial connection error: {e}")
+            # Do not leak a port opened before the failure
+            if opened is not None:
+                try:
+                    opened.close()
+                except Exception:
+                    pass
+            self._port_cache = None
+            self.logger.error("Serial connection error: %s", e)
             raise GPSConnectionError(f"Failed to connect to serial port: {e}")
 
+    def _enable_low_latency(self) -> None:
+        """
+        Ask the USB-serial driver to deliver bytes as they arrive.
+        
+        FTDI/CP210x drivers otherwise batch input on a ~16 ms timer. pyserial
+        sets ASYNC_LOW_LATENCY through TIOCSSERIAL on Linux; elsewhere (where
+        it raises NotImplementedError), or if the driver refuses, the port
+        keeps its default behaviour.
+        """
+        set_low_latency = getattr(self.serial_port, 'set_low_latency_mode', None)
+        if set_low_latency is None:
+            return
+        
+        try:
+            set_low_latency(True)
+        except (NotImplementedError, OSError, ValueError) as e:
+            self.logger.debug("Low-latency mode unavailable: %s", e)
+
     def connect_to_database(self) -> None:
         """Establish connection to the MySQL database."""
+        import mysql.connector
+        
         try:
             self.db_manager = DatabaseManager(
                 host=self.config.db_host,
                 user=self.config.db_user,
                 password=self.config.db_password,
-                database=self.config.db_name
+                database=self.config.db_name,
+                pool_size=self.config.pool_size
             )
             self.logger.info("Connected to database successfully")
         except mysql.connector.Error as e:
-            self.logger.error(f"Database connection error: {e}")
+            self.logger.error("Database connection error: %s", e)
             raise DatabaseConnectionError(f"Failed to connect to database: {e}")
 
     def insert_into_database(self, gps_data: GPSData) -> None:
         """Insert parsed GPS data into the database."""
-        query = """
-            INSERT INTO tbl_gps_data 
-            (latd, lond, gps_date, gps_time, speed, bearing, interval_type) 
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-        """
-        
-        params = (
-            gps_data.coordinate.latitude,
-            gps_data.coordinate.longitude,
-            gps_data.date,
-            gps_data.time,
-            gps_data.speed_kmh,
-            gps_data.bearing,
-            gps_data.fix_quality
-        )
-        
+        self.insert_batch([gps_data])
+
+    def insert_batch(self, batch: List[GPSData]) -> bool:
+        """Insert a batch of parsed GPS data using a single transaction."""
+        return self._insert_rows([
+            (
+                gps_data.coordinate.latitude,
+                gps_data.coordinate.longitude,
+                gps_data.date,
+                gps_data.time,
+                gps_data.speed_kmh,
+                gps_data.bearing,
+                gps_data.fix_quality
+            )
+            for gps_data in batch
+        ])
+
+    def _insert_rows(self, rows: List[GPSRow]) -> bool:
+        """Insert rows already in _INSERT_SQL column order; True on success."""
         try:
-            self.db_manager.execute_query(query, params)
-            self.logger.debug("Data inserted successfully")
+            self.db_manager.execute_many(self._INSERT_SQL, rows)
+            self.logger.debug("Inserted %d rows successfully", len(rows))
+            return True
         except DatabaseConnectionError as e:
-            self.logger.error(f"Failed to insert data: {e}")
+            self.logger.error("Failed to insert data: %s", e)
+            return False
 
-    def process_nmea_data(self, line: str) -> None:
-        """Process NMEA sentences and queue the data."""
+    def process_nmea_data(self, line: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """Parse a single NMEA sentence; None if unsupported or invalid."""
         try:
-            if line.startswith('$GNGGA'):
-                data = self.nmea_parser.parse_gngga_sentence(line)
-                if data:
-                    self._data_queue.put(data)
-            elif line.startswith('$GNVTG'):
-                data = self.nmea_parser.parse_gnvtg_sentence(line)
-                if data:
-                    self._data_queue.put(data)
+            if isinstance(line, str):
+                line = line.encode('ascii', errors='replace')
+            
+            # Unsupported sentence types are dropped without being decoded
+            parser = NMEAParser.PARSERS.get(line[:6])
+            if parser is None:
+                return None
+            
+            return parser(line)
         except Exception as e:
-            self.logger.error(f"Error processing NMEA data: {e}")
+            self.logger.error("Error processing NMEA data: %s", e)
+            return None
 
-    def gps_data_handler(self) -> None:
-        """Continuously read from the serial port and process data."""
-        combined_data: Dict[str, Any] = {}
+    def _raise_reader_priority(self) -> None:
+        """Move the calling thread to SCHED_FIFO if configured and permitted."""
+        priority = self.config.reader_priority
+        if priority <= 0 or not hasattr(os, 'sched_setscheduler'):
+            return
+        
+        try:
+            # On Linux, pid 0 targets the calling thread only
+            os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(priority))
+            self.logger.info("Serial reader running with SCHED_FIFO priority %d", priority)
+        except (OSError, ValueError) as e:
+            self.logger.warning("Could not raise serial reader priority: %s", e)
+
+    def _open_selector(self, serial_port: 'serial.Serial') -> Optional[selectors.BaseSelector]:
+        """
+        Watch the serial port and the stop pipe for readability.
         
-        while not self._stop_event.is_set():
+        Returns None where the port has no selectable descriptor (e.g. on
+        Windows), in which case the reader falls back to timed blocking reads.
+        """
+        if os.name != 'posix' or self._stop_r is None:
+            return None
+        
+        try:
+            fd = serial_port.fileno()
+        except (AttributeError, OSError, ValueError):
+            return None
+        if not isinstance(fd, int) or fd < 0:
+            return None
+        
+        selector = selectors.DefaultSelector()
+        selector.register(fd, selectors.EVENT_READ)
+        selector.register(self._stop_r, selectors.EVENT_READ)
+        return selector
+
+    def serial_reader(self) -> None:
+        """Read and parse serial data, queueing completed fixes (producer)."""
+        from serial import SerialException
+        
+        self._raise_reader_priority()
+        
+        fix = _FixAccumulator()
+        fixes: List[GPSRow] = []
+        buffer = bytearray()
+        
+        # Bind everything the loop touches to locals (LOAD_FAST instead of
+        # attribute/global lookups); serial_port is rebound after a reconnect
+        collect_fixes = self._collect_fixes
+        iter_sentences = self.nmea_parser.iter_sentences
+        ring = self._ring
+        append = ring.append
+        maxlen = ring.maxlen
+        wake = self._wake.set
+        stopped = self._stop_event.is_set
+        find_newline = buffer.rfind
+        serial_port = self.serial_port
+        read = getattr(serial_port, 'read', None)
+        stop_fd = self._stop_r
+        selector = self._open_selector(serial_port)
+        errors = 0
+        
+        while not stopped():
             try:
-                if not self.serial_port.is_open:
-                    raise GPSConnectionError("Serial port closed unexpectedly")
+                if selector is not None:
+                    # Sleep in the kernel until bytes arrive or stop() is called,
+                    # rather than waking every serial timeout to poll
+                    if any(key.fd == stop_fd for key, _ in selector.select()):
+                        break
                     
-                line = self.serial_port.readline().decode('ascii', errors='replace').strip()
-                if not line:
+                # Block for at least one byte, then drain everything already buffered
+                buffer += read(serial_port.in_waiting or 1)
+                errors = 0
+                end = find_newline(b'\n') + 1
+                if not end:
+                    if len(buffer) > _MAX_PARTIAL_LINE:
+                        self.logger.warning("Discarding %d bytes without a line break", len(buffer))
+                        buffer.clear()
                     continue
                     
-                self.process_nmea_data(line)
+                # Complete lines are parsed in place; only the trailing
+                # partial line is kept for the next read
+                collect_fixes(list(iter_sentences(buffer, 0, end)), fix, fixes)
+                del buffer[:end]
                 
-                # Process queued data
-                while not self._data_queue.empty():
-                    data = self._data_queue.get()
-                    combined_data.update(data)
-                    
-                    if self._is_data_complete(combined_data):
-                        gps_data = GPSData(
-                            coordinate=GPSCoordinate(
-                                combined_data['latitude'],
-                                combined_data['longitude']
-                            ),
-                            date=combined_data['date'],
-                            time=combined_data['time'],
-                            num_satellites=combined_data.get('num_satellites', 0),
-                            high_accuracy=combined_data.get('high_accuracy', False),
-                            fix_quality=combined_data.get('fix_quality', 0),
-                            speed_kmh=combined_data.get('speed_kmh'),
-                            bearing=combined_data.get('bearing')
-                        )
-                        
-                        self.insert_into_database(gps_data)
-                        combined_data.clear()
+                for row in fixes:
+                    # A full ring evicts its oldest fix, so a stalled consumer
+                    # (e.g. slow database) never blocks reads from the UART
+                    if len(ring) == maxlen:
+                        self.logger.warning("Fix ring full, dropped oldest fix")
+                    append(row)
+                    if len(ring) == 1:
+                        wake()
+                fixes.clear()
                         
+            except SerialException as e:
+                # A closed or unplugged port surfaces here on the next read
+                self.logger.error("Error in serial reader: %s", e)
+                errors = min(errors + 1, 8)
+                if not stopped():
+                    self.logger.info("Attempting to reconnect serial port...")
+                    # Back off while the device stays unplugged, or keeps failing
+                    # right after reopening, instead of rescanning in a tight loop
+                    if not self._reconnect_serial() or errors > 1:
+                        self._backoff(errors)
+                    serial_port = self.serial_port
+                    read = getattr(serial_port, 'read', None)
+                    buffer.clear()
+                    if selector is not None:
+                        selector.close()
+                    selector = self._open_selector(serial_port)
             except Exception as e:
-                self.logger.error(f"Error in GPS data handler: {e}")
-                if not self._stop_event.is_set():
-                    self.logger.info("Attempting to reconnect...")
-                    self.reconnect()
+                self.logger.error("Error in serial reader: %s", e)
+                buffer.clear()
+                errors = min(errors + 1, 8)
+                self._backoff(errors)
+        
+        if selector is not None:
+            selector.close()
+
+    def _backoff(self, errors: int) -> None:
+        """Wait exponentially longer after consecutive reader errors; stop() ends the wait early."""
+        self._stop_event.wait(min(0.1 * 2 ** (errors - 1), _MAX_READER_BACKOFF))
+
+    def gps_data_handler(self) -> None:
+        """
+        Store fixes queued by the serial reader in batches (consumer).
+        
+        A batch is flushed once it holds batch_size fixes or flush_interval
+        seconds have passed since the last flush, whichever comes first.
+        Fixes from a failed flush are kept and retried with the next batch.
+        """
+        pending: List[GPSRow] = []
+        
+        insert_batch = self._insert_rows
+        append = pending.append
+        popleft = self._ring.popleft
+        wait = self._wake.wait
+        clear = self._wake.clear
+        stopped = self._stop_event.is_set
+        monotonic = time.monotonic
+        batch_size = self.config.batch_size
+        flush_interval = self.config.flush_interval
+        max_pending = self._MAX_PENDING
+        
+        flush_at = batch_size
+        last_flush = monotonic()
+        
+        while True:
+            try:
+                append(popleft())
+            except IndexError:
+                # Only exit once the reader's backlog has been processed
+                if stopped():
+                    break
+                remaining = flush_interval - (monotonic() - last_flush)
+                if not pending or remaining > 0:
+                    wait(remaining if pending else flush_interval)
+                    clear()
+                    continue
+            else:
+                if len(pending) < flush_at and monotonic() - last_flush < flush_interval:
+                    continue
+                    
+            try:
+                flushed = insert_batch(pending)
+            except Exception as e:
+                self.logger.error("Error in GPS data handler: %s", e)
+                flushed = False
+                
+            if flushed:
+                pending.clear()
+            elif len(pending) > max_pending:
+                self.logger.warning(
+                    "Database unavailable, dropping %d oldest fixes",
+                    len(pending) - max_pending
+                )
+                del pending[:-max_pending]
+            # After a failure, wait for another full batch (or interval) before retrying
+            flush_at = len(pending) + batch_size
+            last_flush = monotonic()
+        
+        # Flush whatever is left so a shutdown does not drop fixes
+        if pending and self.db_manager:
+            insert_batch(pending)
+
+    def _collect_fixes(
+        self,
+        sentences: Iterable[bytes],
+        fix: _FixAccumulator,
+        pending: List[GPSRow]
+    ) -> None:
+        """Feed sentences into the accumulator and append each completed fix's row to pending."""
+        get_handler = self._handlers.get
+        is_complete = fix.is_complete
+        append = pending.append
+        
+        for sentence in sentences:
+            handler = get_handler(sentence[:6])
+            if handler is None or not handler(sentence, fix):
+                continue
+                
+            if is_complete():
+                append(fix.to_row())
+                fix.reset()
 
     @staticmethod
-    def _is_data_complete(data: Dict[str, Any]) -> bool:
-        """Check if we have all required GPS data fields."""
-        required_fields = {'latitude', 'longitude', 'date', 'time', 'speed_kmh'}
-        return all(field in data for field in required_fields)
+    def _apply_log_date(
+        rows: List[GPSRow],
+        start: int,
+        date: datetime.date,
+        last_hour: Optional[int]
+    ) -> Tuple[datetime.date, Optional[int]]:
+        """Re-date rows[start:] from date, advancing a day each time the clock wraps past midnight."""
+        for i in range(start, len(rows)):
+            row = rows[i]
+            hour = row[3].hour
+            # Compare against the previous hour rather than expecting 23 -> 0,
+            # so a reception gap across midnight still advances the date
+            if last_hour is not None and hour < last_hour:
+                date += datetime.timedelta(days=1)
+            last_hour = hour
+            rows[i] = row[:2] + (date,) + row[3:]
+        return date, last_hour
+
+    def parse_file(
+        self,
+        path: str,
+        batch_size: int = 1000,
+        chunk_size: int = 1 << 20,
+        date: Optional[datetime.date] = None
+    ) -> int:
+        """
+        Parse a recorded NMEA log file and store every complete fix.
+        
+        The file is read in chunks and each chunk is scanned in a single pass,
+        so multi-gigabyte logs are replayed without loading them into memory.
+        GNGGA carries no date, so pass the date the log starts on when
+        replaying an older recording; otherwise the current UTC date is used.
+        
+        Args:
+            path: Path to a file of newline-separated NMEA sentences
+            batch_size: Number of fixes per database transaction
+            chunk_size: Number of bytes read from the file at a time
+            date: UTC date of the first fix in the log, advanced at midnight
+        
+        Returns:
+            int: Number of fixes stored from the file
+        
+        Raises:
+            DatabaseConnectionError: If a batch could not be stored
+        """
+        if self.db_manager is None:
+            self.connect_to_database()
+        
+        fix = _FixAccumulator()
+        pending: List[GPSRow] = []
+        buffer = bytearray()
+        total = 0
+        last_hour: Optional[int] = None
+        
+        with open(path, 'rb') as log_file:
+            while True:
+                chunk = log_file.read(chunk_size)
+                if chunk:
+                    buffer += chunk
+                    end = buffer.rfind(b'\n') + 1
+                else:
+                    # Last line may lack a trailing newline
+                    end = len(buffer)
+                
+                start = len(pending)
+                self._collect_fixes(list(self.nmea_parser.iter_sentences(buffer, 0, end)), fix, pending)
+                if date is not None:
+                    date, last_hour = self._apply_log_date(pending, start, date, last_hour)
+                del buffer[:end]
+                
+                # Store full batches; a partial one waits for more fixes or EOF
+                stored = 0
+                while len(pending) - stored >= batch_size or (not chunk and stored < len(pending)):
+                    batch = pending[stored:stored + batch_size]
+                    if not self._insert_rows(batch):
+                        raise DatabaseConnectionError(
+                            f"Failed to store fixes from {path} after {total} rows"
+                        )
+                    stored += len(batch)
+                    total += len(batch)
+                del pending[:stored]
+                
+                if not chunk:
+                    break
+        
+        self.logger.info("Parsed %d fixes from %s", total, path)
+        return total
+
+    def _reconnect_serial(self) -> bool:
+        """Reopen the serial port without touching the database connection; True on success."""
+        try:
+            if self.serial_port and self.serial_port.is_open:
+                self.serial_port.close()
+            self.connect_to_serial()
+            return True
+        except Exception as e:
+            self.logger.error("Serial reconnection failed: %s", e)
+            return False
 
     def reconnect(self) -> None:
         """Attempt to reconnect to serial port and database."""
         try:
-            self.close()
+            # The stop pipe stays open: the reader's selector may still be
+            # registered on it
+            self._release_connections()
             self.connect_to_serial()
             self.connect_to_database()
         except Exception as e:
-            self.logger.error(f"Reconnection failed: {e}")
+            self.logger.error("Reconnection failed: %s", e)
 
     def start(self) -> None:
-        """Start the GPS parser in a separate thread."""
+        """Start the serial reader and GPS data handler threads."""
         self.connect_to_serial()
         self.connect_to_database()
         
         self._stop_event.clear()
+        if self._stop_r is None and os.name == 'posix':
+            self._stop_r, self._stop_w = os.pipe()
+            os.set_blocking(self._stop_w, False)
+        self.reader_thread = threading.Thread(target=self.serial_reader)
+        self.reader_thread.daemon = True
         self.gps_thread = threading.Thread(target=self.gps_data_handler)
         self.gps_thread.daemon = True
         self.gps_thread.start()
+        self.reader_thread.start()
 
     def stop(self) -> None:
         """Stop the GPS parser gracefully."""
         self._stop_event.set()
+        self._wake.set()
+        if self._stop_w is not None:
+            try:
+                os.write(self._stop_w, b'\0')
+            except BlockingIOError:
+                # Pipe already full, so the reader has a wakeup pending
+                pass
+        if hasattr(self, 'reader_thread'):
+            self.reader_thread.join(timeout=5.0)
         if hasattr(self, 'gps_thread'):
             self.gps_thread.join(timeout=5.0)
         self.close()
@@ -229,29 +636,61 @@ class GPSParser:
     def close(self) -> None:
         """Cleanup method to properly close connections and release resources."""
         try:
-            if self.serial_port and self.serial_port.is_open:
-                self.serial_port.close()
-            if self.db_manager:
-                self.db_manager = None
+            try:
+                self._release_connections()
+            finally:
+                self._close_stop_pipe()
             self.logger.info("Cleaned up resources successfully")
         except Exception as e:
-            self.logger.error(f"Error during cleanup: {e}")
+            self.logger.error("Error during cleanup: %s", e)
+
+    def _release_connections(self) -> None:
+        """Close the serial port and database manager, leaving the stop pipe open."""
+        # A failure closing the port must not keep the database manager alive
+        try:
+            if self.serial_port and self.serial_port.is_open:
+                self.serial_port.close()
+        finally:
+            if self.db_manager is not None:
+                self.db_manager.close()
+            self.db_manager = None
+
+    def _close_stop_pipe(self) -> None:
+        """Release the stop pipe descriptors, if open."""
+        for fd in (self._stop_r, self._stop_w):
+            if fd is not None:
+                os.close(fd)
+        self._stop_r = self._stop_w = None
+
+    def __enter__(self) -> 'GPSParser':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def __del__(self) -> None:
+        # Last-resort release of the port if neither stop() nor `with` was used
+        serial_port = getattr(self, 'serial_port', None)
+        try:
+            if serial_port is not None and serial_port.is_open:
+                serial_port.close()
+        except Exception:
+            pass
 
 def main() -> None:
     """Initialize and run the GPS parser."""
-    parser = GPSParser()
-    
-    try:
-        parser.start()
-        # Keep the main thread alive
-        while True:
-            threading.Event().wait(1)
-    except KeyboardInterrupt:
-        parser.logger.info("Shutting down GPS parser...")
-    except Exception as e:
-        parser.logger.critical(f"Fatal error: {e}")
-    finally:
-        parser.stop()
+    # Configure handlers once per process, not per GPSParser instance
+    setup_logging('gps_parser.log')
+    with GPSParser() as parser:
+        try:
+            parser.start()
+            # Keep the main thread alive
+            while True:
+                threading.Event().wait(1)
+        except KeyboardInterrupt:
+            parser.logger.info("Shutting down GPS parser...")
+        except Exception as e:
+            parser.logger.critical("Fatal error: %s", e)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -6,7 +6,7 @@ A comprehensive module for GPS data processing, validation, and database operati
 
 Features:
     - GPS coordinate validation and conversion
-    - NMEA sentence parsing (GNGGA, GNVTG)
+    - NMEA sentence parsing (GGA, VTG from GN or GP talkers)
     - Timezone conversion utilities
     - Database operations with connection pooling
     - Rotating log management
@@ -14,7 +14,6 @@ Features:
 """
 
 import logging
-from dataclasses import dataclass
 from typing import List, Dict, Any, Optional, Union, Tuple
 
 # Setup module logger
@@ -31,9 +30,6 @@ from .helpers import (
     GPSCoordinate,
     GPSData,
 
-    # Database Management
-    DatabaseManager,
-
     # NMEA Parsing
     NMEAParser,
 
@@ -54,6 +50,14 @@ from .helpers import (
     setup_logging
 )
 
+def __getattr__(name: str) -> Any:
+    """Import the database layer only when it is first used."""
+    if name == 'DatabaseManager':
+        from .helpers_db import DatabaseManager
+        globals()[name] = DatabaseManager
+        return DatabaseManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 def validate_coordinates(
     latitude: float,
     longitude: float
@@ -105,7 +109,7 @@ def convert_coordinates(
 
 def get_supported_sentences() -> List[str]:
     """Return list of supported NMEA sentence types."""
-    return ['GNGGA', 'GNVTG']
+    return [prefix[1:].decode('ascii') for prefix in NMEAParser.PARSERS]
 
 def format_nmea_data(
     data: Dict[str, Any],
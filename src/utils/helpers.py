@@ -1,12 +1,25 @@
 import os
-import pytz
+import re
+import sys
+import math
+import operator
+import functools
 import logging
+import time
 import datetime
-import mysql.connector
-import logging.handlers
 from decimal import Decimal
-from dataclasses import dataclass
-from typing import Dict, Any, Optional, Tuple, Union
+from dataclasses import dataclass, field, fields
+from typing import Dict, Any, Iterator, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+# pytz (Python 3.8 only) is imported inside the function that needs it, and the
+# database code lives in helpers_db, so the parsing utilities load neither
+
+try:
+    from zoneinfo import ZoneInfo  # Python 3.9+, C-accelerated
+except ImportError:
+    ZoneInfo = None
 
 # Custom Exceptions
 class GPSConnectionError(Exception):
@@ -21,20 +34,29 @@ class NMEAParseError(Exception):
     """Exception raised for errors in parsing NMEA sentences."""
     pass
 
+# __slots__ on dataclasses needs Python 3.10+; older versions keep a __dict__
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
 # Data Classes for better type safety and cleaner code
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class GPSCoordinate:
     """Represents a GPS coordinate with validation."""
     latitude: float
     longitude: float
 
     def __post_init__(self):
-        if not is_valid_latitude(self.latitude):
-            raise ValueError(f"Invalid latitude: {self.latitude}")
-        if not is_valid_longitude(self.longitude):
-            raise ValueError(f"Invalid longitude: {self.longitude}")
+        # Same checks as is_valid_latitude/is_valid_longitude, inlined because
+        # a coordinate is built for every fix; other types go through float()
+        # so e.g. Decimal('NaN') fails as a ValueError, not InvalidOperation
+        lat, lon = self.latitude, self.longitude
+        if not (-90.0 <= lat <= 90.0 if type(lat) is float else
+                isinstance(lat, (int, float, Decimal)) and -90 <= float(lat) <= 90):
+            raise ValueError(f"Invalid latitude: {lat}")
+        if not (-180.0 <= lon <= 180.0 if type(lon) is float else
+                isinstance(lon, (int, float, Decimal)) and -180 <= float(lon) <= 180):
+            raise ValueError(f"Invalid longitude: {lon}")
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class GPSData:
     """Represents parsed GPS data."""
     coordinate: GPSCoordinate
@@ -45,14 +67,56 @@ class GPSData:
     fix_quality: int
     speed_kmh: Optional[float] = None
     bearing: Optional[float] = None
+    
+    # Derived values, computed on first access and then reused
+    _lat_dms: Optional[Tuple[int, int, float]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _lon_dms: Optional[Tuple[int, int, float]] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    _utc_datetime: Optional[datetime.datetime] = field(
+        default=None, init=False, repr=False, compare=False
+    )
+    
+    @property
+    def lat_dms(self) -> Tuple[int, int, float]:
+        """Latitude as (degrees, minutes, seconds)."""
+        if self._lat_dms is None:
+            self._lat_dms = decimal_degrees_to_dms(self.coordinate.latitude)
+        return self._lat_dms
+    
+    @property
+    def lon_dms(self) -> Tuple[int, int, float]:
+        """Longitude as (degrees, minutes, seconds)."""
+        if self._lon_dms is None:
+            self._lon_dms = decimal_degrees_to_dms(self.coordinate.longitude)
+        return self._lon_dms
+    
+    @property
+    def utc_datetime(self) -> datetime.datetime:
+        """Timezone-aware UTC datetime of the fix."""
+        if self._utc_datetime is None:
+            self._utc_datetime = datetime.datetime.combine(
+                self.date, self.time, tzinfo=datetime.timezone.utc
+            )
+        return self._utc_datetime
 
 # Validation functions
+# Exact float/int checks come first; isinstance() with the Decimal tuple is
+# only reached for other numeric types
 def is_valid_latitude(lat: float) -> bool:
     """Validate if a given value is a valid latitude."""
+    kind = type(lat)
+    if kind is float or kind is int:
+        return -90.0 <= lat <= 90.0
     return isinstance(lat, (int, float, Decimal)) and -90 <= float(lat) <= 90
 
 def is_valid_longitude(lon: float) -> bool:
     """Validate if a given value is a valid longitude."""
+    kind = type(lon)
+    if kind is float or kind is int:
+        return -180.0 <= lon <= 180.0
     return isinstance(lon, (int, float, Decimal)) and -180 <= float(lon) <= 180
 
 # Conversion functions with better type hints
@@ -65,12 +129,30 @@ def decimal_degrees_to_dms(degrees: float) -> Tuple[int, int, float]:
     Convert decimal degrees to degrees, minutes, and seconds (DMS).
     
     Returns:
-        Tuple of (degrees, minutes, seconds)
+        Tuple of (degrees, minutes, seconds); seconds are not rounded, so
+        format them for display (e.g. f"{seconds:.6f}")
     """
-    d = int(degrees)
-    m = int((degrees - d) * 60)
-    s = round((degrees - d - m / 60) * 3600, 6)  # Round to 6 decimal places
-    return d, m, s
+    fraction, d = math.modf(degrees)
+    fraction, m = math.modf(fraction * 60.0)
+    return int(d), int(m), fraction * 60.0
+
+# Zones without DST (or historical changes since the GPS era), converted with a
+# fixed offset instead of a zoneinfo rule lookup; names match what ZoneInfo reports
+_FIXED_OFFSET_ZONES = {
+    'Asia/Kolkata': datetime.timezone(datetime.timedelta(hours=5, minutes=30), 'IST'),
+    'Asia/Dubai': datetime.timezone(datetime.timedelta(hours=4), '+04'),
+}
+
+@functools.lru_cache(maxsize=32)
+def _tz(name: str) -> datetime.tzinfo:
+    """Resolve a timezone by name once; later lookups skip the zoneinfo loader."""
+    fixed = _FIXED_OFFSET_ZONES.get(name)
+    if fixed is not None:
+        return fixed
+    if ZoneInfo is not None:
+        return ZoneInfo(name)
+    import pytz
+    return pytz.timezone(name)
 
 def utc_to_timezone(utc_time: datetime.datetime, timezone: str = 'Asia/Kolkata') -> datetime.datetime:
     """
@@ -84,136 +166,359 @@ def utc_to_timezone(utc_time: datetime.datetime, timezone: str = 'Asia/Kolkata')
         Localized datetime object
     """
     if not utc_time.tzinfo:
-        utc_time = pytz.utc.localize(utc_time)
-    return utc_time.astimezone(pytz.timezone(timezone))
+        utc_time = utc_time.replace(tzinfo=datetime.timezone.utc)
+    return utc_time.astimezone(_tz(timezone))
+
+@functools.lru_cache(maxsize=2)
+def _date_isoformat(gps_date: datetime.date) -> str:
+    """ISO text for a date; consecutive fixes share one, so this rarely misses."""
+    return gps_date.isoformat()
 
 def format_gps_datetime(gps_date: Union[datetime.date, str], 
                        gps_time: Union[datetime.time, str]) -> str:
     """Format GPS date and time into ISO 8601."""
     if isinstance(gps_date, str) and isinstance(gps_time, str):
         return f"{gps_date}T{gps_time}"
-    return f"{gps_date.isoformat()}T{gps_time.isoformat()}"
-
-# Database functions with connection pooling
-class DatabaseManager:
-    """Manages database connections and operations."""
-    
-    def __init__(self, host: str, user: str, password: str, database: str):
-        self.pool = mysql.connector.pooling.MySQLConnectionPool(
-            pool_name="gps_pool",
-            pool_size=5,
-            host=host,
-            user=user,
-            password=password,
-            database=database
+    return f"{_date_isoformat(gps_date)}T{gps_time.isoformat()}"
+
+# Unix epoch as a proleptic Gregorian ordinal, for integer date arithmetic
+_EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+_NS_PER_DAY = 86_400 * 10**9
+
+# Last (GPS hour, UTC date) pair used to date GNGGA fixes. It is replaced as
+# a whole tuple, so threads parsing concurrently never see a torn pair.
+_utc_date_cache: Tuple[Optional[int], Optional[datetime.date]] = (None, None)
+
+def _current_utc_date(hours: int) -> datetime.date:
+    """Return the current UTC date, reading the clock only when the GPS hour changes."""
+    global _utc_date_cache
+    cached_hours, cached_date = _utc_date_cache
+    if cached_hours != hours:
+        today = datetime.date.fromordinal(
+            _EPOCH_ORDINAL + time.time_ns() // _NS_PER_DAY
         )
+        # GPS time wrapped past midnight; a system clock lagging the receiver
+        # by a few seconds must not date the new day's fixes as yesterday
+        if cached_hours == 23 and hours == 0 and today <= cached_date:
+            today = cached_date + datetime.timedelta(days=1)
+        cached_date = today
+        _utc_date_cache = (hours, cached_date)
+    return cached_date
+
+# Quality of the last GGA fix that was unusable, or None while fixes are
+# valid, so a lost fix is logged once rather than for every sentence
+_lost_fix_quality: Optional[int] = None
+
+# Last (raw hhmmss.ss field, parsed time) pair seen by the GNGGA parser
+_gps_time_cache: Tuple[Optional[bytes], Optional[datetime.time]] = (None, None)
+
+def _parse_gps_time(utc_time: bytes) -> datetime.time:
+    """Parse an NMEA UTC time field, reusing the result for a repeated timestamp."""
+    global _gps_time_cache
+    cached_raw, cached_time = _gps_time_cache
+    if utc_time == cached_raw:
+        return cached_time
     
-    def execute_query(self, query: str, params: tuple = None) -> None:
-        """Execute a database query with proper connection handling."""
-        with self.pool.get_connection() as connection:
-            try:
-                with connection.cursor() as cursor:
-                    cursor.execute(query, params)
-                connection.commit()
-            except mysql.connector.Error as err:
-                connection.rollback()
-                logging.error(f"Database error: {err}")
-                raise DatabaseConnectionError(f"Query execution failed: {err}")
-            finally:
-                connection.close()
+    # Fractional seconds are read as integer microseconds, avoiding the
+    # float round-trip (0.29 s used to become 289999 us)
+    gps_time = datetime.time(
+        int(utc_time[0:2]),
+        int(utc_time[2:4]),
+        int(utc_time[4:6]),
+        int(utc_time[7:13].ljust(6, b'0')) if len(utc_time) > 7 else 0
+    )
+    _gps_time_cache = (utc_time, gps_time)
+    return gps_time
+
+# Minutes to degrees, as a multiplication instead of a division
+_INV_60 = 1.0 / 60.0
+
+# Precompiled NMEA layouts; only the fields the parsers use are captured,
+# with degrees and minutes split so no slicing is needed afterwards. Both
+# require a two-hex-digit *HH checksum ending the sentence, so malformed,
+# truncated or trailing-garbage sentences never reach the field conversions.
+_GNGGA_RE = re.compile(
+    rb'\$G[NP]GGA,'
+    rb'(?P<time>\d{6}(?:\.\d+)?)?,'                               # UTC hhmmss.ss
+    rb'(?:(?P<lat_deg>\d{2})(?P<lat_min>\d{2}(?:\.\d+)?))?,(?P<lat_dir>[NS])?,'
+    rb'(?:(?P<lon_deg>\d{3})(?P<lon_min>\d{2}(?:\.\d+)?))?,(?P<lon_dir>[EW])?,'
+    rb'(?P<fix>\d)?,(?P<sats>\d*),'                               # fix quality, satellites
+    rb'(?:[^,]*,){6}'                                             # HDOP through DGPS age
+    rb'[^*\r\n]*\*(?P<checksum>[0-9A-Fa-f]{2})\r?$'                # station ID, *HH
+)
+
+_GNVTG_RE = re.compile(
+    rb'\$G[NP]VTG,'
+    rb'(?P<bearing>\d+(?:\.\d+)?)?,T?,'        # course over ground (true)
+    rb'[^,]*,M?,'                              # course over ground (magnetic)
+    rb'(?P<knots>\d+(?:\.\d+)?)?,N?,'          # speed over ground in knots
+    rb'[^,*]*,K?'                              # speed over ground in km/h
+    rb'[^*\r\n]*\*(?P<checksum>[0-9A-Fa-f]{2})\r?$'  # mode indicator, *HH
+)
+
+def _fold_steps(length: int) -> Tuple[Tuple[int, int], ...]:
+    """(shift, mask) pairs that fold a length-byte integer in half down to one byte."""
+    steps = []
+    while length > 1:
+        length = (length + 1) >> 1
+        steps.append((length << 3, (1 << (length << 3)) - 1))
+    return tuple(steps)
+
+# Fold schedules for every payload length up to well past NMEA's 82 characters
+_FOLD_STEPS = tuple(_fold_steps(length) for length in range(128))
+
+def _nmea_checksum(payload: bytes) -> int:
+    """XOR of every byte between '$' and '*', as transmitted after the '*'."""
+    if len(payload) >= len(_FOLD_STEPS):
+        return functools.reduce(operator.xor, payload, 0)
+    
+    # SWAR: read the payload as one integer and XOR its upper half onto its
+    # lower half until a single byte is left, ~7 big-int ops instead of one
+    # Python-level XOR per byte
+    value = int.from_bytes(payload, 'little')
+    for shift, mask in _FOLD_STEPS[len(payload)]:
+        value = (value >> shift) ^ (value & mask)
+    return value
+
+def _verify_checksum(sentence: bytes, match: 're.Match[bytes]') -> None:
+    """Raise NMEAParseError if the sentence's *HH checksum does not match."""
+    checksum = match.group('checksum')
+    
+    # The checksum covers everything after '$' up to (not including) '*'
+    if _nmea_checksum(sentence[1:match.start('checksum') - 1]) != int(checksum, 16):
+        raise NMEAParseError(f"Checksum mismatch: expected {checksum.decode('ascii')}")
 
 # Improved NMEA parsing with better error handling
 class NMEAParser:
     """Handles parsing of NMEA sentences."""
     
+    # Field names produced by each sentence type, in parse order
+    GNGGA_FIELDS = (
+        'latitude', 'longitude', 'date', 'time',
+        'num_satellites', 'high_accuracy', 'fix_quality'
+    )
+    GNVTG_FIELDS = ('bearing', 'speed_kmh')
+    
+    @staticmethod
+    def iter_sentences(
+        buffer: Union[bytes, bytearray],
+        start: int = 0,
+        end: Optional[int] = None
+    ) -> Iterator[bytes]:
+        """
+        Yield supported sentences from a buffer of newline-separated NMEA data.
+        
+        The whole buffer is scanned by a single compiled pattern, so lines of
+        unsupported sentence types are skipped without being copied.
+        """
+        if end is None:
+            end = len(buffer)
+        for match in _SENTENCE_RE.finditer(buffer, start, end):
+            yield match.group()
+    
     @staticmethod
-    def parse_gngga_sentence(sentence: str) -> Optional[Dict[str, Any]]:
+    def parse_gngga_sentence(sentence: Union[str, bytes]) -> Optional[Dict[str, Any]]:
         """Parse GNGGA sentence with improved error handling and validation."""
+        fields = NMEAParser._parse_gngga_fields(sentence)
+        return dict(zip(NMEAParser.GNGGA_FIELDS, fields)) if fields else None
+    
+    @staticmethod
+    def parse_gngga_into(sentence: Union[str, bytes], target: Any) -> bool:
+        """Parse GNGGA sentence and store its fields as attributes of target."""
+        fields = NMEAParser._parse_gngga_fields(sentence)
+        if fields is None:
+            return False
+        
+        (target.latitude, target.longitude, target.date, target.time,
+         target.num_satellites, target.high_accuracy, target.fix_quality) = fields
+        return True
+    
+    @staticmethod
+    def parse_gnvtg_sentence(sentence: Union[str, bytes]) -> Optional[Dict[str, Any]]:
+        """Parse GNVTG sentence for course over ground and speed."""
+        fields = NMEAParser._parse_gnvtg_fields(sentence)
+        return dict(zip(NMEAParser.GNVTG_FIELDS, fields)) if fields else None
+    
+    @staticmethod
+    def parse_gnvtg_into(sentence: Union[str, bytes], target: Any) -> bool:
+        """Parse GNVTG sentence and store its fields as attributes of target."""
+        fields = NMEAParser._parse_gnvtg_fields(sentence)
+        if fields is None:
+            return False
+        
+        target.bearing, target.speed_kmh = fields
+        return True
+    
+    @staticmethod
+    def _parse_gngga_fields(sentence: Union[str, bytes]) -> Optional[tuple]:
+        """Parse GNGGA sentence into a tuple ordered like GNGGA_FIELDS."""
+        global _lost_fix_quality
         try:
-            parts = sentence.strip().split(',')
+            if isinstance(sentence, str):
+                sentence = sentence.encode('ascii', errors='replace')
             
-            if not sentence.startswith("$GNGGA") or len(parts) < 15:
+            match = _GNGGA_RE.match(sentence)
+            if match is None:
                 raise NMEAParseError("Invalid GNGGA sentence format")
+            _verify_checksum(sentence, match)
+            
+            (utc_time, lat_deg, lat_min, lat_dir, lon_deg, lon_min, lon_dir,
+             raw_fix, raw_sats) = match.group(
+                'time', 'lat_deg', 'lat_min', 'lat_dir',
+                'lon_deg', 'lon_min', 'lon_dir', 'fix', 'sats'
+            )
             
-            fix_quality = int(parts[6]) if parts[6] else 0
+            fix_quality = int(raw_fix) if raw_fix else 0
             if fix_quality in [0, 6, 7, 8]:
-                logging.warning(f"Invalid GPS fix quality: {fix_quality}")
+                if fix_quality != _lost_fix_quality:
+                    logger.warning("Invalid GPS fix quality: %s", fix_quality)
+                    _lost_fix_quality = fix_quality
                 return None
+            if _lost_fix_quality is not None:
+                logger.info("GPS fix regained (quality %s)", fix_quality)
+                _lost_fix_quality = None
             
-            # Parse time
-            utc_time = parts[1]
-            if len(utc_time) < 6:
-                raise NMEAParseError("Invalid time format")
-                
-            hours = int(utc_time[0:2])
-            minutes = int(utc_time[2:4])
-            seconds = float(utc_time[4:])
-            
-            gps_time = datetime.time(
-                hours, 
-                minutes, 
-                int(seconds), 
-                int((seconds - int(seconds)) * 1e6)
-            )
+            # Parse time; receivers leave it empty only before a fix
+            if utc_time is None:
+                raise NMEAParseError("Missing UTC time")
+            gps_time = _parse_gps_time(utc_time)
             
             # Parse coordinates with better validation
             try:
-                latitude = NMEAParser._parse_latitude(parts[2], parts[3])
-                longitude = NMEAParser._parse_longitude(parts[4], parts[5])
+                latitude = NMEAParser._parse_latitude(lat_deg, lat_min, lat_dir)
+                longitude = NMEAParser._parse_longitude(lon_deg, lon_min, lon_dir)
             except ValueError as e:
                 raise NMEAParseError(f"Coordinate parsing error: {e}")
             
-            # Create GPS data object
-            gps_data = GPSData(
-                coordinate=GPSCoordinate(latitude, longitude),
-                date=datetime.datetime.utcnow().date(),
-                time=gps_time,
-                num_satellites=int(parts[7]) if parts[7] else 0,
-                high_accuracy=fix_quality in [4, 5],
-                fix_quality=fix_quality
+            # Return only the fields GNGGA provides, so merging with GNVTG
+            # data does not clobber speed and bearing
+            return (
+                latitude,
+                longitude,
+                _current_utc_date(gps_time.hour),
+                gps_time,
+                int(raw_sats) if raw_sats else 0,
+                fix_quality in [4, 5],
+                fix_quality
             )
             
-            return dataclass_to_dict(gps_data)
+        except (ValueError, NMEAParseError) as e:
+            logger.error("Error parsing GNGGA sentence: %s", e)
+            return None
+    
+    @staticmethod
+    def _parse_gnvtg_fields(sentence: Union[str, bytes]) -> Optional[tuple]:
+        """Parse GNVTG sentence into a tuple ordered like GNVTG_FIELDS."""
+        try:
+            if isinstance(sentence, str):
+                sentence = sentence.encode('ascii', errors='replace')
+            
+            match = _GNVTG_RE.match(sentence)
+            if match is None:
+                raise NMEAParseError("Invalid GNVTG sentence format")
+            _verify_checksum(sentence, match)
             
-        except (IndexError, ValueError, NMEAParseError) as e:
-            logging.error(f"Error parsing GNGGA sentence: {e}")
+            raw_bearing, raw_speed = match.group('bearing', 'knots')
+            if not raw_speed:
+                raise NMEAParseError("Missing speed data")
+            
+            return (
+                float(raw_bearing) if raw_bearing else None,
+                float(raw_speed) * 1.852  # knots_to_kmh, inlined
+            )
+            
+        except (ValueError, NMEAParseError) as e:
+            logger.error("Error parsing GNVTG sentence: %s", e)
             return None
     
     @staticmethod
-    def _parse_latitude(raw_lat: str, direction: str) -> float:
-        """Parse latitude from NMEA format."""
-        if not raw_lat or not direction:
+    def _parse_latitude(
+        degrees: Optional[bytes],
+        minutes: Optional[bytes],
+        direction: Optional[bytes]
+    ) -> float:
+        """Parse latitude from its NMEA degree and minute fields."""
+        if not degrees or not direction:
             raise ValueError("Missing latitude data")
             
-        degrees = int(raw_lat[:2])
-        minutes = float(raw_lat[2:])
-        latitude = degrees + minutes / 60
+        latitude = int(degrees) + float(minutes) * _INV_60
+        
+        # Same bound as GPSCoordinate, checked here so the parser never has
+        # to build a throwaway coordinate object
+        if latitude > 90.0:
+            raise ValueError(f"Latitude out of range: {latitude}")
         
-        return -latitude if direction == 'S' else latitude
+        return -latitude if direction == b'S' else latitude
     
     @staticmethod
-    def _parse_longitude(raw_lon: str, direction: str) -> float:
-        """Parse longitude from NMEA format."""
-        if not raw_lon or not direction:
+    def _parse_longitude(
+        degrees: Optional[bytes],
+        minutes: Optional[bytes],
+        direction: Optional[bytes]
+    ) -> float:
+        """Parse longitude from its NMEA degree and minute fields."""
+        if not degrees or not direction:
             raise ValueError("Missing longitude data")
             
-        degrees = int(raw_lon[:3])
-        minutes = float(raw_lon[3:])
-        longitude = degrees + minutes / 60
+        longitude = int(degrees) + float(minutes) * _INV_60
         
-        return -longitude if direction == 'W' else longitude
+        if longitude > 180.0:
+            raise ValueError(f"Longitude out of range: {longitude}")
+        
+        return -longitude if direction == b'W' else longitude
+    
+    # Sentence prefix (raw bytes, as on the wire) -> parser; the single
+    # source of truth for which sentence types are supported. GPS-only
+    # receivers use the GP talker ID for the same sentence layouts.
+    PARSERS = {
+        b'$GNGGA': parse_gngga_sentence.__func__,
+        b'$GNVTG': parse_gnvtg_sentence.__func__,
+        b'$GPGGA': parse_gngga_sentence.__func__,
+        b'$GPVTG': parse_gnvtg_sentence.__func__
+    }
+    INTO_PARSERS = {
+        b'$GNGGA': parse_gngga_into.__func__,
+        b'$GNVTG': parse_gnvtg_into.__func__,
+        b'$GPGGA': parse_gngga_into.__func__,
+        b'$GPVTG': parse_gnvtg_into.__func__
+    }
+
+# Finds every supported sentence in a buffer of raw serial or log data
+_SENTENCE_RE = re.compile(
+    rb'^(?:' + b'|'.join(map(re.escape, NMEAParser.PARSERS)) + rb'),[^\r\n]*',
+    re.MULTILINE
+)
 
 # Helper function to convert dataclass to dict
+@functools.lru_cache(maxsize=None)
+def _dataclass_schema(cls: type) -> Tuple[Tuple[str, Optional[bool]], ...]:
+    """
+    Public field names of a dataclass, each with whether it holds a dataclass.
+    
+    The flag is None when the annotation is not a plain class (e.g. Optional
+    or a string), in which case the value itself is checked on conversion.
+    """
+    schema = []
+    for f in fields(cls):
+        if f.name.startswith('_'):
+            continue
+        nested = hasattr(f.type, '__dataclass_fields__') if isinstance(f.type, type) else None
+        schema.append((f.name, nested))
+    return tuple(schema)
+
 def dataclass_to_dict(obj: Any) -> Dict[str, Any]:
     """Convert a dataclass instance to a dictionary."""
-    if hasattr(obj, '__dataclass_fields__'):
-        return {
-            field: dataclass_to_dict(getattr(obj, field))
-            if hasattr(getattr(obj, field), '__dataclass_fields__')
-            else getattr(obj, field)
-            for field in obj.__dataclass_fields__
-        }
-    return obj
+    cls = type(obj)
+    if not hasattr(cls, '__dataclass_fields__'):
+        return obj
+    
+    result = {}
+    for name, nested in _dataclass_schema(cls):
+        value = getattr(obj, name)
+        if nested or (nested is None and hasattr(value, '__dataclass_fields__')):
+            value = dataclass_to_dict(value)
+        result[name] = value
+    return result
 
 # Setup logging with rotation
 def setup_logging(
@@ -227,7 +532,9 @@ def setup_logging(
         if log_dir and not os.path.exists(log_dir):
             os.makedirs(log_dir)
 
-    handler = logging.handlers.RotatingFileHandler(
+    from logging.handlers import RotatingFileHandler
+
+    handler = RotatingFileHandler(
         log_file,
         maxBytes=max_bytes,
         backupCount=backup_count
@@ -246,3 +553,12 @@ def setup_logging(
     else:
         # Optionally replace existing handlers or update them
         root_logger.handlers = [handler]
+
+def __getattr__(name: str) -> Any:
+    # DatabaseManager moved to helpers_db; keep `from .helpers import
+    # DatabaseManager` working without importing it for parser-only users
+    if name == 'DatabaseManager':
+        from .helpers_db import DatabaseManager
+        globals()[name] = DatabaseManager
+        return DatabaseManager
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,137 @@
+import re
+import logging
+import functools
+import itertools
+import threading
+from typing import Optional, Sequence
+
+from .helpers import DatabaseConnectionError
+
+logger = logging.getLogger(__name__)
+
+# mysql.connector is imported inside the methods that need it, so even this
+# module can be imported without loading the driver
+
+# Splits "INSERT ... VALUES (%s, ...)" into its prefix and row placeholder
+_VALUES_RE = re.compile(r'^(.*\bVALUES\s*)(\([^()]*\))\s*;?\s*$', re.IGNORECASE | re.DOTALL)
+
+@functools.lru_cache(maxsize=16)
+def _multi_row_statement(query: str, rows: int) -> Optional[str]:
+    """Rewrite a single-row INSERT ... VALUES query to insert rows at once, if possible."""
+    match = _VALUES_RE.match(query)
+    if match is None:
+        return None
+    prefix, placeholder = match.groups()
+    return prefix + ', '.join([placeholder] * rows)
+
+# Database functions with connection pooling
+class DatabaseManager:
+    """Manages database connections and operations."""
+    
+    def __init__(
+        self,
+        host: str,
+        user: str,
+        password: str,
+        database: str,
+        pool_size: int = 5
+    ):
+        import mysql.connector.pooling
+        
+        # Prefer the C extension (falls back to pure Python if it is not
+        # installed) and commit explicitly, once per batch. Sessions hold no
+        # per-checkout state, so the reset round-trip on return is skipped.
+        self.pool = mysql.connector.pooling.MySQLConnectionPool(
+            pool_name="gps_pool",
+            pool_size=pool_size,
+            pool_reset_session=False,
+            host=host,
+            user=user,
+            password=password,
+            database=database,
+            use_pure=False,
+            autocommit=False
+        )
+        
+        # Connection and prepared cursor kept open across execute_many calls,
+        # so the INSERT is prepared once per connection rather than per batch
+        self._lock = threading.Lock()
+        self._connection = None
+        self._cursor = None
+    
+    def execute_query(self, query: str, params: tuple = None) -> None:
+        """Execute a database query with proper connection handling."""
+        import mysql.connector
+        
+        with self.pool.get_connection() as connection:
+            try:
+                with connection.cursor() as cursor:
+                    cursor.execute(query, params)
+                connection.commit()
+            except mysql.connector.Error as err:
+                connection.rollback()
+                logger.error("Database error: %s", err)
+                raise DatabaseConnectionError(f"Query execution failed: {err}")
+            finally:
+                connection.close()
+
+    # Rows per multi-row INSERT; 1000 rows of 7 columns stays far below both
+    # the 65535 placeholder limit and a default max_allowed_packet
+    MULTI_ROW_CHUNK = 1000
+    
+    def execute_many(self, query: str, params_seq: Sequence[tuple]) -> None:
+        """
+        Execute a query for each parameter set and commit them together.
+        
+        A simple INSERT ... VALUES (...) query is rewritten to insert up to
+        MULTI_ROW_CHUNK rows per statement, since the prepared cursor would
+        otherwise send one statement per row. Statements are prepared on a
+        persistent cursor, so full chunks reuse the same prepared statement.
+        After an error the cursor and its connection are discarded and
+        recreated on the next call.
+        """
+        import mysql.connector
+        
+        chunk_size = self.MULTI_ROW_CHUNK
+        flatten = itertools.chain.from_iterable
+        
+        with self._lock:
+            try:
+                if self._cursor is None:
+                    self._connection = self.pool.get_connection()
+                    self._cursor = self._connection.cursor(prepared=True)
+                
+                if _multi_row_statement(query, 1) is None:
+                    self._cursor.executemany(query, params_seq)
+                else:
+                    for start in range(0, len(params_seq), chunk_size):
+                        chunk = params_seq[start:start + chunk_size]
+                        self._cursor.execute(
+                            _multi_row_statement(query, len(chunk)),
+                            tuple(flatten(chunk))
+                        )
+                self._connection.commit()
+            except mysql.connector.Error as err:
+                if self._connection is not None:
+                    try:
+                        self._connection.rollback()
+                    except mysql.connector.Error:
+                        pass
+                self._release_cursor()
+                logger.error("Database error: %s", err)
+                raise DatabaseConnectionError(f"Batch execution failed: {err}")
+    
+    def close(self) -> None:
+        """Release the persistent cursor and return its connection to the pool."""
+        with self._lock:
+            self._release_cursor()
+    
+    def _release_cursor(self) -> None:
+        """Close the persistent cursor and connection, ignoring errors; caller holds _lock."""
+        for resource in (self._cursor, self._connection):
+            if resource is not None:
+                try:
+                    resource.close()
+                except Exception:
+                    pass
+        self._cursor = self._connection = None
@@ -1,9 +1,28 @@
+import os
 import pytest
 import serial
+import datetime
 import configparser
 from src.gps_parser import GPSParser
 from unittest.mock import patch, MagicMock
-from src.utils.helpers import GPSConnectionError, DatabaseConnectionError
+from src.utils.helpers import (
+    GPSConnectionError,
+    DatabaseConnectionError,
+    GPSCoordinate,
+    GPSData
+)
+
+def make_gps_data(latitude, longitude):
+    return GPSData(
+        coordinate=GPSCoordinate(latitude, longitude),
+        date="2024-01-01",
+        time="12:00:00",
+        num_satellites=8,
+        high_accuracy=False,
+        fix_quality=1,
+        speed_kmh=50,
+        bearing=90
+    )
 
 @patch('serial.tools.list_ports.comports')
 def test_auto_select_serial_port(mock_comports):
@@ -33,46 +52,199 @@ def test_connect_to_serial(mock_comports, mock_serial):
     
     parser = GPSParser(config_file='config/config.example.ini')
     parser.connect_to_serial()
-    mock_serial.assert_called_once_with(port="/dev/ttyUSB0", baudrate=parser.baudrate, timeout=parser.timeout)
-
-@patch('src.gps_parser.create_database_connection')
-def test_connect_to_database_success(mock_create_db):
-    fake_conn = MagicMock()
-    fake_cursor = MagicMock()
-    fake_conn.cursor.return_value = fake_cursor
-    mock_create_db.return_value = fake_conn
+    mock_serial.assert_called_once_with(port="/dev/ttyUSB0", baudrate=parser.config.baudrate, timeout=parser.config.timeout)
+
+@patch('serial.Serial')
+@patch('serial.tools.list_ports.comports')
+def test_connect_to_serial_without_low_latency_support(mock_comports, mock_serial):
+    fake_port = MagicMock()
+    fake_port.description = "CP2102N USB to UART Bridge Controller"
+    fake_port.device = "/dev/ttyUSB0"
+    mock_comports.return_value = [fake_port]
+    # pyserial raises this on non-Linux POSIX platforms
+    mock_serial.return_value.set_low_latency_mode.side_effect = NotImplementedError
+    
+    parser = GPSParser(config_file='config/config.example.ini')
+    parser.connect_to_serial()
+    assert parser.serial_port is mock_serial.return_value
+    mock_serial.return_value.close.assert_not_called()
+
+@patch('serial.Serial')
+@patch('serial.tools.list_ports.comports')
+def test_connect_to_serial_closes_port_on_failure(mock_comports, mock_serial):
+    fake_port = MagicMock()
+    fake_port.description = "CP2102N USB to UART Bridge Controller"
+    fake_port.device = "/dev/ttyUSB0"
+    mock_comports.return_value = [fake_port]
     
+    parser = GPSParser(config_file='config/config.example.ini')
+    with patch.object(parser, '_enable_low_latency', side_effect=RuntimeError("driver error")):
+        with pytest.raises(GPSConnectionError):
+            parser.connect_to_serial()
+    mock_serial.return_value.close.assert_called_once()
+
+@patch('src.gps_parser.DatabaseManager')
+def test_connect_to_database_success(mock_db_manager):
     parser = GPSParser(config_file='config/config.example.ini')
     parser.connect_to_database()
-    assert parser.db_connection == fake_conn
-    assert parser.cursor == fake_cursor
+    assert parser.db_manager == mock_db_manager.return_value
 
-def test_insert_into_database_invalid_coordinates():
+def test_gps_coordinate_rejects_invalid_coordinates():
+    # Out-of-range coordinates never become GPSData, so they cannot reach an insert
+    with pytest.raises(ValueError):
+        GPSCoordinate(1000, 2000)
+
+def test_insert_into_database_failure():
     parser = GPSParser(config_file='config/config.example.ini')
-    parser.db_connection = MagicMock()
-    parser.cursor = MagicMock()
-    # Use invalid coordinates so that the insert should not occur.
-    parser.insert_into_database(1000, 2000, "2024-01-01", "12:00:00", 50, 90, 1)
-    parser.cursor.execute.assert_not_called()
+    parser.db_manager = MagicMock()
+    parser.db_manager.execute_many.side_effect = DatabaseConnectionError("Lost connection")
+    # A failed insert is logged and reported, not raised to the caller
+    assert parser.insert_batch([make_gps_data(45.0, 90.0)]) is False
+    parser.db_manager.execute_many.assert_called_once()
 
 def test_insert_into_database_valid_coordinates():
     parser = GPSParser(config_file='config/config.example.ini')
-    parser.db_connection = MagicMock()
-    parser.cursor = MagicMock()
+    parser.db_manager = MagicMock()
     # Use valid coordinates
-    parser.insert_into_database(45.0, 90.0, "2024-01-01", "12:00:00", 50, 90, 1)
-    parser.cursor.execute.assert_called_once()
+    parser.insert_into_database(make_gps_data(45.0, 90.0))
+    parser.db_manager.execute_many.assert_called_once()
 
 def test_close_resources():
     parser = GPSParser(config_file='config/config.example.ini')
-    fake_cursor = MagicMock()
-    fake_db_conn = MagicMock()
+    fake_db_manager = MagicMock()
     fake_serial = MagicMock()
     fake_serial.is_open = True
-    parser.cursor = fake_cursor
-    parser.db_connection = fake_db_conn
+    parser.db_manager = fake_db_manager
     parser.serial_port = fake_serial
     parser.close()
-    fake_cursor.close.assert_called_once()
-    fake_db_conn.close.assert_called_once()
+    fake_db_manager.close.assert_called_once()
     fake_serial.close.assert_called_once()
+    assert parser.db_manager is None
+
+def test_reconnect_keeps_stop_pipe_open():
+    parser = GPSParser(config_file='config/config.example.ini')
+    parser._stop_r, parser._stop_w = stop_pipe = os.pipe()
+    parser.db_manager = MagicMock()
+    with patch.object(parser, 'connect_to_serial'), \
+         patch.object(parser, 'connect_to_database'):
+        parser.reconnect()
+    assert (parser._stop_r, parser._stop_w) == stop_pipe
+    os.fstat(parser._stop_r)
+    parser.close()
+    assert parser._stop_r is None
+
+@patch('serial.tools.list_ports.comports')
+def test_serial_reader_backs_off_while_port_is_missing(mock_comports):
+    mock_comports.return_value = []
+    parser = GPSParser(config_file='config/config.example.ini')
+    parser.serial_port = MagicMock()
+    parser.serial_port.in_waiting = 0
+    parser.serial_port.read.side_effect = serial.SerialException("device unplugged")
+    
+    waits = []
+    def backoff(errors):
+        waits.append(errors)
+        if len(waits) == 3:
+            parser._stop_event.set()
+    
+    with patch.object(parser, '_backoff', side_effect=backoff):
+        parser.serial_reader()
+    # Every failed reconnect waits, with the error count growing
+    assert waits == [1, 2, 3]
+    assert mock_comports.call_count == 3
+
+def run_data_handler(parser, rows, failures):
+    """Queue rows, fail the first `failures` inserts, and drain the ring once."""
+    attempts = []
+    def execute_many(query, batch):
+        attempts.append(list(batch))
+        if len(attempts) <= failures:
+            raise DatabaseConnectionError("Lost connection")
+    
+    parser.db_manager = MagicMock()
+    parser.db_manager.execute_many.side_effect = execute_many
+    parser.config.batch_size = 4
+    parser.config.flush_interval = 60.0
+    parser._ring.extend(rows)
+    # Stopping first makes the consumer exit once the ring is drained
+    parser._stop_event.set()
+    parser.gps_data_handler()
+    return attempts
+
+def test_gps_data_handler_retries_failed_batches():
+    parser = GPSParser(config_file='config/config.example.ini')
+    rows = [(float(i), float(i)) for i in range(20)]
+    
+    attempts = run_data_handler(parser, rows, failures=2)
+    # Failed batches are retried together with the next one
+    assert [len(batch) for batch in attempts] == [4, 8, 12, 4, 4]
+    stored = [row for batch in attempts[2:] for row in batch]
+    assert stored == rows
+
+def test_gps_data_handler_trims_pending_while_database_is_down():
+    parser = GPSParser(config_file='config/config.example.ini')
+    parser._MAX_PENDING = 6
+    rows = [(float(i), float(i)) for i in range(20)]
+    
+    attempts = run_data_handler(parser, rows, failures=len(rows))
+    # Only the newest fixes are kept, and the final flush still tries them
+    assert all(len(batch) <= parser._MAX_PENDING + 4 for batch in attempts)
+    assert attempts[-1][-1] == rows[-1]
+    assert rows[0] not in attempts[-1]
+
+NMEA_LOG = (
+    "$GNVTG,054.7,T,034.4,M,005.5,N,010.2,K*56\r\n"
+    "$GNGGA,235959.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*7B\r\n"
+    "$GNVTG,054.7,T,034.4,M,005.5,N,010.2,K*56\r\n"
+    "$GNGGA,000001.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*7B\r\n"
+)
+
+def test_parse_file_dates_fixes_across_midnight(tmp_path):
+    log_file = tmp_path / "log.nmea"
+    log_file.write_text(NMEA_LOG)
+    parser = GPSParser(config_file='config/config.example.ini')
+    parser.db_manager = MagicMock()
+    stored = []
+    parser.db_manager.execute_many.side_effect = lambda query, rows: stored.extend(rows)
+    
+    total = parser.parse_file(str(log_file), date=datetime.date(2024, 1, 31))
+    assert total == 2
+    assert [row[2] for row in stored] == [datetime.date(2024, 1, 31), datetime.date(2024, 2, 1)]
+
+def test_parse_file_dates_fixes_across_midnight_gap(tmp_path):
+    log_file = tmp_path / "log.nmea"
+    log_file.write_text(
+        "$GNVTG,054.7,T,034.4,M,005.5,N,010.2,K*56\r\n"
+        "$GNGGA,235000.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*7E\r\n"
+        "$GNVTG,054.7,T,034.4,M,005.5,N,010.2,K*56\r\n"
+        "$GNGGA,011000.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*7A\r\n"
+    )
+    parser = GPSParser(config_file='config/config.example.ini')
+    parser.db_manager = MagicMock()
+    stored = []
+    parser.db_manager.execute_many.side_effect = lambda query, rows: stored.extend(rows)
+    
+    parser.parse_file(str(log_file), date=datetime.date(2024, 1, 31))
+    assert [row[2] for row in stored] == [datetime.date(2024, 1, 31), datetime.date(2024, 2, 1)]
+
+def test_parse_file_inserts_in_batch_size_slices(tmp_path):
+    log_file = tmp_path / "log.nmea"
+    log_file.write_text(NMEA_LOG * 5 + NMEA_LOG[:NMEA_LOG.index("$GNVTG", 1)])
+    parser = GPSParser(config_file='config/config.example.ini')
+    parser.db_manager = MagicMock()
+    batches = []
+    parser.db_manager.execute_many.side_effect = lambda query, rows: batches.append(len(rows))
+    
+    total = parser.parse_file(str(log_file), batch_size=4)
+    assert total == 11
+    assert batches == [4, 4, 3]
+
+def test_parse_file_insert_failure(tmp_path):
+    log_file = tmp_path / "log.nmea"
+    log_file.write_text(NMEA_LOG)
+    parser = GPSParser(config_file='config/config.example.ini')
+    parser.db_manager = MagicMock()
+    parser.db_manager.execute_many.side_effect = DatabaseConnectionError("Lost connection")
+    
+    with pytest.raises(DatabaseConnectionError):
+        parser.parse_file(str(log_file), date=datetime.date(2024, 1, 31))
@@ -1,6 +1,7 @@
 import pytest
 import datetime
-import pytz
+from decimal import Decimal
+from unittest.mock import patch
 from src.utils.helpers import (
     is_valid_latitude,
     is_valid_longitude,
@@ -8,8 +9,10 @@ from src.utils.helpers import (
     decimal_degrees_to_dms,
     utc_to_timezone,
     format_gps_datetime,
-    parse_gngga_sentence,
-    parse_gnvtg_sentence
+    GPSCoordinate,
+    GPSData,
+    NMEAParser,
+    _current_utc_date
 )
 
 def test_is_valid_latitude():
@@ -20,6 +23,11 @@ def test_is_valid_longitude():
     assert is_valid_longitude(120)
     assert not is_valid_longitude(200)
 
+def test_gps_coordinate_rejects_decimal_nan():
+    with pytest.raises(ValueError):
+        GPSCoordinate(Decimal('NaN'), 0.0)
+    assert GPSCoordinate(Decimal('12.5'), Decimal('-45.25')).latitude == Decimal('12.5')
+
 def test_knots_to_kmh():
     assert knots_to_kmh(10) == 18.52
 
@@ -30,7 +38,7 @@ def test_decimal_degrees_to_dms():
     assert isinstance(s, float)
 
 def test_utc_to_timezone():
-    utc_time = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=pytz.utc)
+    utc_time = datetime.datetime(2024, 1, 1, 12, 0, 0, tzinfo=datetime.timezone.utc)
     local_time = utc_to_timezone(utc_time, 'Asia/Kolkata')
     # Asia/Kolkata is UTC+5:30, so expect 17:30 (12:00 + 5:30)
     assert local_time.hour == 17 and local_time.minute == 30
@@ -41,26 +49,116 @@ def test_format_gps_datetime():
     formatted = format_gps_datetime(date, time)
     assert formatted == "2024-01-01T17:30:00"
 
+def test_current_utc_date_rolls_over_when_clock_lags():
+    def clock_ns(*args):
+        moment = datetime.datetime(*args, tzinfo=datetime.timezone.utc)
+        return int(moment.timestamp()) * 10**9
+    
+    with patch('src.utils.helpers._utc_date_cache', (None, None)), \
+         patch('time.time_ns') as mock_time_ns:
+        mock_time_ns.return_value = clock_ns(2024, 1, 31, 23, 59, 58)
+        assert _current_utc_date(23) == datetime.date(2024, 1, 31)
+        # GPS time wrapped to 00h while the host clock still reads 23:59:59
+        mock_time_ns.return_value = clock_ns(2024, 1, 31, 23, 59, 59)
+        assert _current_utc_date(0) == datetime.date(2024, 2, 1)
+        # Once the host clock catches up the date does not advance again
+        mock_time_ns.return_value = clock_ns(2024, 2, 1, 1, 0, 0)
+        assert _current_utc_date(1) == datetime.date(2024, 2, 1)
+    
+    with patch('src.utils.helpers._utc_date_cache', (None, None)), \
+         patch('time.time_ns') as mock_time_ns:
+        mock_time_ns.return_value = clock_ns(2024, 1, 31, 23, 59, 58)
+        _current_utc_date(23)
+        # A host clock already past midnight is used as is
+        mock_time_ns.return_value = clock_ns(2024, 2, 1, 0, 0, 1)
+        assert _current_utc_date(0) == datetime.date(2024, 2, 1)
+
 def test_parse_gngga_sentence_valid():
-    sentence = "$GNGGA,123519.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47"
-    result = parse_gngga_sentence(sentence)
+    sentence = "$GNGGA,123519.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*77"
+    result = NMEAParser.parse_gngga_sentence(sentence)
     assert result is not None
     assert 'latitude' in result
     assert 'longitude' in result
 
 def test_parse_gnvtg_sentence_valid():
-    sentence = "$GNVTG,054.7,T,034.4,M,005.5,N,010.2,K*48"
-    result = parse_gnvtg_sentence(sentence)
+    sentence = "$GNVTG,054.7,T,034.4,M,005.5,N,010.2,K*56"
+    result = NMEAParser.parse_gnvtg_sentence(sentence)
     assert result is not None
     assert 'speed_kmh' in result
     assert 'bearing' in result
 
 def test_parse_gngga_sentence_invalid():
     sentence = "Invalid Sentence"
-    result = parse_gngga_sentence(sentence)
+    result = NMEAParser.parse_gngga_sentence(sentence)
     assert result is None
 
 def test_parse_gnvtg_sentence_invalid():
     sentence = "Invalid Sentence"
-    result = parse_gnvtg_sentence(sentence)
+    result = NMEAParser.parse_gnvtg_sentence(sentence)
+    assert result is None
+
+def test_parse_gngga_sentence_bad_checksum():
+    sentence = "$GNGGA,123519.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47"
+    result = NMEAParser.parse_gngga_sentence(sentence)
+    assert result is None
+
+def test_parse_gngga_sentence_no_fix():
+    sentence = "$GNGGA,,,,,,0,00,99.99,,,,,,*56"
+    with patch('src.utils.helpers._lost_fix_quality', None), \
+         patch('src.utils.helpers.logger') as mock_logger:
+        result = NMEAParser.parse_gngga_sentence(sentence)
     assert result is None
+    mock_logger.warning.assert_called_once()
+    mock_logger.error.assert_not_called()
+
+def test_lost_fix_is_logged_once_until_regained():
+    no_fix = "$GNGGA,,,,,,0,00,99.99,,,,,,*56"
+    valid = "$GNGGA,123519.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*77"
+    with patch('src.utils.helpers._lost_fix_quality', None), \
+         patch('src.utils.helpers.logger') as mock_logger:
+        for _ in range(3):
+            NMEAParser.parse_gngga_sentence(no_fix)
+        mock_logger.warning.assert_called_once()
+        assert NMEAParser.parse_gngga_sentence(valid) is not None
+        mock_logger.info.assert_called_once()
+        NMEAParser.parse_gngga_sentence(no_fix)
+    assert mock_logger.warning.call_count == 2
+
+def test_parse_gngga_sentence_malformed_checksum():
+    base = "$GNGGA,123519.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,"
+    for tail in ("*ZZ", "*5G", "#77", "*77garbage", "*7", ""):
+        assert NMEAParser.parse_gngga_sentence(base + tail) is None
+
+def test_parse_gngga_sentence_truncated():
+    sentence = "$GNGGA,123519.00,4807.038,N,01131.000,E,1,08,0.9"
+    result = NMEAParser.parse_gngga_sentence(sentence)
+    assert result is None
+
+def test_parse_gnvtg_sentence_malformed_checksum():
+    base = "$GNVTG,054.7,T,034.4,M,005.5,N,010.2,K"
+    for tail in ("*ZZ", "*5G", "#56", "*56garbage", ""):
+        assert NMEAParser.parse_gnvtg_sentence(base + tail) is None
+
+def test_parse_gngga_sentence_with_line_ending():
+    sentence = "$GNGGA,123519.00,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*77\r\n"
+    result = NMEAParser.parse_gngga_sentence(sentence)
+    assert result is not None
+
+def test_gps_data_derived_values_are_cached():
+    gps_data = GPSData(
+        coordinate=GPSCoordinate(12.3456, 77.5),
+        date=datetime.date(2024, 1, 1),
+        time=datetime.time(12, 0, 0),
+        num_satellites=8,
+        high_accuracy=False,
+        fix_quality=1
+    )
+    assert gps_data.lat_dms == decimal_degrees_to_dms(12.3456)
+    assert gps_data.lat_dms is gps_data.lat_dms
+    assert gps_data.utc_datetime.tzinfo == datetime.timezone.utc
+
+def test_parse_gpgga_sentence_valid():
+    sentence = "$GPGGA,123519,4807.038,N,01131.000,E,1,08,0.9,545.4,M,46.9,M,,*47"
+    result = NMEAParser.PARSERS[sentence[:6].encode()](sentence)
+    assert result is not None
+    assert 'latitude' in result
@@ -0,0 +1,51 @@
+import pytest
+import mysql.connector
+from unittest.mock import patch
+from src.utils.helpers import DatabaseConnectionError
+from src.utils.helpers_db import DatabaseManager
+
+INSERT_SQL = "INSERT INTO gps_data (latitude, longitude) VALUES (%s, %s)"
+
+def make_db_manager():
+    with patch('mysql.connector.pooling.MySQLConnectionPool') as mock_pool:
+        db_manager = DatabaseManager("localhost", "user", "password", "gps")
+    connection = mock_pool.return_value.get_connection.return_value
+    return db_manager, connection, connection.cursor.return_value
+
+def test_execute_many_sends_multi_row_chunks():
+    db_manager, connection, cursor = make_db_manager()
+    rows = [(float(i), float(i)) for i in range(2500)]
+
+    db_manager.execute_many(INSERT_SQL, rows)
+
+    statements = [call.args for call in cursor.execute.call_args_list]
+    assert [len(params) for _, params in statements] == [2000, 2000, 1000]
+    assert statements[0][0] == (
+        "INSERT INTO gps_data (latitude, longitude) VALUES "
+        + ", ".join(["(%s, %s)"] * 1000)
+    )
+    assert statements[2][0].count("(%s, %s)") == 500
+    assert statements[2][1][:4] == (2000.0, 2000.0, 2001.0, 2001.0)
+    cursor.executemany.assert_not_called()
+    connection.commit.assert_called_once()
+
+def test_execute_many_falls_back_for_non_values_query():
+    db_manager, connection, cursor = make_db_manager()
+    query = "UPDATE gps_data SET latitude = %s WHERE id = %s"
+    rows = [(1.0, 1), (2.0, 2)]
+
+    db_manager.execute_many(query, rows)
+
+    cursor.executemany.assert_called_once_with(query, rows)
+    cursor.execute.assert_not_called()
+    connection.commit.assert_called_once()
+
+def test_execute_many_failure_rolls_back():
+    db_manager, connection, cursor = make_db_manager()
+    cursor.execute.side_effect = mysql.connector.Error("Lost connection")
+
+    with pytest.raises(DatabaseConnectionError):
+        db_manager.execute_many(INSERT_SQL, [(1.0, 1.0)])
+    connection.rollback.assert_called_once()
+    connection.commit.assert_not_called()
+    cursor.close.assert_called_once()